@@ -0,0 +1,53 @@
+"""
+Medium URL detection and Freedium mirror rewriting, shared by the tracker
+and the Medium test scripts.
+"""
+
+from functools import lru_cache
+from urllib.parse import urlsplit
+
+# Medium itself; the tracker only rewrites posts on these domains
+MEDIUM_DOMAINS = frozenset({'medium.com'})
+
+# Publications that have been served from their own domains. Publications can
+# leave Medium, so these are only checked by the test scripts, never rewritten
+# by the tracker.
+CUSTOM_MEDIUM_DOMAINS = frozenset({
+    'towardsdatascience.com',
+    'betterprogramming.pub',
+    'uxdesign.cc',
+})
+KNOWN_MEDIUM_DOMAINS = MEDIUM_DOMAINS | CUSTOM_MEDIUM_DOMAINS
+
+# Anything shorter than http://<shortest domain> can't be on Medium
+_MIN_URL_LENGTH = len('http://') + min(len(domain) for domain in KNOWN_MEDIUM_DOMAINS)
+
+# Medium posts are read through the Freedium mirror
+FREEDIUM_PREFIX = "https://freedium-mirror.cfd/"
+
+
+@lru_cache(maxsize=4096)
+def is_medium_url(url, domains=MEDIUM_DOMAINS):
+    """Check if a URL is hosted on one of domains (Medium itself by default).
+    
+    Cached because the same item URLs come back on every poll of a feed.
+    """
+    if not url or len(url) < _MIN_URL_LENGTH:
+        return False
+    try:
+        # hostname is already lowercased, and only the host is worth checking
+        host = urlsplit(url).hostname or ''
+    except ValueError:
+        return False
+    # Look up the host and then each parent domain in the set, so the cost
+    # grows with the number of labels in the host, not the number of domains
+    while host:
+        if host in domains:
+            return True
+        host = host.partition('.')[2]
+    return False
+
+
+def to_freedium(url):
+    """Rewrite a Medium URL to read it through the Freedium mirror."""
+    return FREEDIUM_PREFIX + url
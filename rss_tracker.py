@@ -9,14 +9,21 @@ import json
 import time
 import logging
 import hashlib
+import re
 import requests
 import argparse
 import signal
+import sqlite3
 import sys
-from datetime import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 import feedparser
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from medium_url import is_medium_url, to_freedium
 
 logging.basicConfig(
     level=logging.INFO,
@@ -31,9 +38,35 @@ WALLABAG_CLIENT_SECRET = os.getenv('WALLABAG_CLIENT_SECRET', '')
 WALLABAG_USERNAME = os.getenv('WALLABAG_USERNAME', '')
 WALLABAG_PASSWORD = os.getenv('WALLABAG_PASSWORD', '')
 FEEDS_FILE = os.getenv('FEEDS_FILE', '/app/feeds.json')
+# Legacy JSON seen items file, imported into SEEN_DB on first run
 SEEN_FILE = os.getenv('SEEN_FILE', '/app/data/seen_items.json')
+# Default to SEEN_FILE's directory, which existing deployments already keep on a volume
+SEEN_DB = os.getenv('SEEN_DB', str(Path(SEEN_FILE).with_suffix('.db')))
+TOKEN_FILE = os.getenv('TOKEN_FILE', str(Path(SEEN_FILE).with_name('token.json')))
 INTERVAL_MINUTES = int(os.getenv('INTERVAL_MINUTES', '30'))
 DEFAULT_FETCH_COUNT = int(os.getenv('DEFAULT_FETCH_COUNT', '10'))
+FETCH_WORKERS = int(os.getenv('FETCH_WORKERS', '8'))
+WALLABAG_POST_DELAY_MS = int(os.getenv('WALLABAG_POST_DELAY_MS', '0'))
+
+USER_AGENT = 'rss-wallabag/1.0'
+
+# Format Wallabag expects for published_at: YYYY-MM-DDTHH:MM:SS+0000
+_PUBLISHED_AT_RE = re.compile(r'^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}[+-]\d{4}$')
+
+
+def create_session(pool_maxsize=16, retry=None):
+    """Create a requests session that keeps connections alive and retries failed connections.
+    
+    Error responses aren't retried: Wallabag calls are POSTs and PATCHes, and
+    re-sending an entry POST could create a duplicate entry.
+    """
+    session = requests.Session()
+    if retry is None:
+        retry = Retry(total=3, backoff_factor=0.3)
+    adapter = HTTPAdapter(pool_maxsize=pool_maxsize, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
 
 
 class WallabagClient:
@@ -47,6 +80,52 @@ class WallabagClient:
         self.password = WALLABAG_PASSWORD
         self.access_token = None
         self.token_expires_at = 0
+        self.session = create_session()
+        self.token_file = Path(TOKEN_FILE)
+        self.load_token()
+    
+    def _token_owner(self):
+        """Identify the Wallabag account a cached token belongs to."""
+        return {'url': self.url, 'client_id': self.client_id, 'username': self.username}
+    
+    def load_token(self):
+        """Load a still-valid access token cached by a previous run, if any."""
+        try:
+            if not self.token_file.is_file():
+                return
+            
+            with open(self.token_file, 'r') as f:
+                token_data = json.load(f)
+            
+            # Ignore tokens for a different Wallabag instance or account
+            if token_data.get('owner') != self._token_owner():
+                return
+            if time.time() >= token_data.get('expires_at', 0):
+                return
+            
+            self.access_token = token_data['access_token']
+            self.token_expires_at = token_data['expires_at']
+            self.session.headers['Authorization'] = f'Bearer {self.access_token}'
+            logger.info("Using cached Wallabag access token")
+        except Exception as e:
+            logger.warning(f"Error loading cached Wallabag token: {e}")
+    
+    def save_token(self):
+        """Cache the access token so later runs can skip requesting a new one."""
+        token_data = {
+            'owner': self._token_owner(),
+            'access_token': self.access_token,
+            'expires_at': self.token_expires_at,
+        }
+        tmp_file = self.token_file.with_suffix('.tmp')
+        try:
+            # Write to a private temp file and rename it so a crash never leaves a partial token file
+            fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(token_data, f)
+            os.replace(tmp_file, self.token_file)
+        except Exception as e:
+            logger.warning(f"Error caching Wallabag token: {e}")
     
     def get_token(self):
         """Get OAuth2 access token from Wallabag."""
@@ -65,12 +144,14 @@ class WallabagClient:
         }
         
         try:
-            response = requests.post(token_url, data=data, timeout=10)
+            response = self.session.post(token_url, data=data, timeout=10)
             response.raise_for_status()
             token_data = response.json()
             self.access_token = token_data.get('access_token')
+            self.session.headers['Authorization'] = f'Bearer {self.access_token}'
             expires_in = token_data.get('expires_in', 3600)
             self.token_expires_at = time.time() + expires_in - 60  # Refresh 1 min early
+            self.save_token()
             logger.info("Successfully obtained Wallabag access token")
             return self.access_token
         except Exception as e:
@@ -92,11 +173,6 @@ class WallabagClient:
         
         entries_url = f"{self.url}/api/entries.json"
         
-        headers = {
-            'Authorization': f'Bearer {self.access_token}',
-            'Content-Type': 'application/json'
-        }
-        
         params = {
             'url': url,
         }
@@ -111,22 +187,23 @@ class WallabagClient:
             params['tags'] = tags
         
         if published_at:
-            # Ensure published_at is a string in the correct format
-            if not isinstance(published_at, str):
-                logger.warning(f"published_at must be a string, got {type(published_at)}")
+            if isinstance(published_at, str) and _PUBLISHED_AT_RE.match(published_at):
+                params['published_at'] = published_at
             else:
-                # Validate format: YYYY-MM-DDTHH:MM:SS+0000 (24 chars)
-                if len(published_at) == 24 and published_at[10] == 'T' and published_at[19] == '+':
-                    params['published_at'] = published_at
-                else:
-                    logger.warning(f"published_at format may be incorrect: {published_at} (expected YYYY-MM-DDTHH:MM:SS+0000)")
-                    # Still send it, but log a warning
-                    params['published_at'] = published_at
+                logger.warning(f"Ignoring malformed published_at: {published_at!r} (expected YYYY-MM-DDTHH:MM:SS+0000)")
+                published_at = None
         
         try:
             if published_at:
                 logger.debug(f"Sending published_at: {published_at} for URL: {url}")
-            response = requests.post(entries_url, headers=headers, json=params, timeout=10)
+            response = self.session.post(entries_url, json=params, timeout=10)
+            if response.status_code == 401:
+                # The (possibly cached) token was rejected, get a new one and retry once
+                logger.warning("Wallabag rejected the access token, requesting a new one")
+                self.access_token = None
+                self.token_expires_at = 0
+                if self.get_token():
+                    response = self.session.post(entries_url, json=params, timeout=10)
             response.raise_for_status()
             result = response.json()
             
@@ -136,12 +213,12 @@ class WallabagClient:
                 if returned_published != published_at:
                     entry_id = result.get('id')
                     if entry_id:
-                        # Wait a moment for content fetching, then update
-                        time.sleep(3)
+                        # Wallabag has finished fetching the content by the time the
+                        # POST returns, and the PATCH is idempotent, so update right away
                         update_url = f"{self.url}/api/entries/{entry_id}.json"
                         update_params = {'published_at': published_at}
                         try:
-                            update_resp = requests.patch(update_url, headers=headers, json=update_params, timeout=10)
+                            update_resp = self.session.patch(update_url, json=update_params, timeout=10)
                             update_resp.raise_for_status()
                             result = update_resp.json()
                             logger.debug(f"Updated published_at to {published_at} for entry {entry_id}")
@@ -162,10 +239,27 @@ class RSSFeedTracker:
     
     def __init__(self):
         self.wallabag = WallabagClient()
+        # Kept separate from the Wallabag session so the token isn't sent to feed hosts
+        # Only retry failed connections: waiting out a feed host's Retry-After or
+        # slow responses would hold a fetch worker for the whole poll
+        feed_retry = Retry(total=2, connect=2, read=0, status=0, backoff_factor=0.3,
+                           respect_retry_after_header=False)
+        self.session = create_session(pool_maxsize=FETCH_WORKERS, retry=feed_retry)
+        self.session.headers['User-Agent'] = USER_AGENT
         self.feeds_file = Path(FEEDS_FILE)
         self.seen_file = Path(SEEN_FILE)
-        self.seen_items = self.load_seen_items()
-        self.shutdown_requested = False
+        self.seen_db_file = Path(SEEN_DB)
+        self.seen_db = self.open_seen_db()
+        # Guards seen_db and the feed metadata, which are shared by the feed worker threads
+        self._seen_lock = threading.Lock()
+        self.import_seen_items()
+        # Per-feed HTTP validators (ETag/Last-Modified) for conditional GETs
+        self.feed_meta = self.load_feed_meta()
+        self._pending_feed_meta = {}
+        # When the last Wallabag POST of this cycle went out, for WALLABAG_POST_DELAY_MS
+        self._last_post_at = None
+        # Set by the signal handler; also lets sleeps end as soon as shutdown is requested
+        self._shutdown_event = threading.Event()
         self._setup_signal_handlers()
     
     def _setup_signal_handlers(self):
@@ -178,7 +272,7 @@ class RSSFeedTracker:
             }
             signal_name = signal_names.get(signum, f'signal {signum}')
             logger.info(f"Received {signal_name}, initiating graceful shutdown...")
-            self.shutdown_requested = True
+            self._shutdown_event.set()
         
         signal.signal(signal.SIGTERM, signal_handler)
         signal.signal(signal.SIGINT, signal_handler)
@@ -197,57 +291,132 @@ class RSSFeedTracker:
             logger.error(f"Error loading feeds: {e}")
             return []
     
-    def load_seen_items(self):
-        """Load seen items from seen_items.json."""
+    def open_seen_db(self):
+        """Open (creating if needed) the seen items SQLite database."""
+        # Check if path exists and is a directory (Docker volume mount issue)
+        if self.seen_db_file.exists() and self.seen_db_file.is_dir():
+            logger.warning(f"{self.seen_db_file.name} is a directory, removing it and creating a new file")
+            import shutil
+            shutil.rmtree(self.seen_db_file)
+        
+        # Autocommit: every seen item is recorded as soon as it is inserted
+        db = sqlite3.connect(self.seen_db_file, isolation_level=None, check_same_thread=False)
+        db.execute('PRAGMA journal_mode=WAL')
+        db.execute('PRAGMA synchronous=NORMAL')
+        db.execute(
+            'CREATE TABLE IF NOT EXISTS seen ('
+            'feed TEXT, hash TEXT, url TEXT, title TEXT, seen_at TEXT, '
+            'PRIMARY KEY (feed, hash)) WITHOUT ROWID'
+        )
+        db.execute('CREATE TABLE IF NOT EXISTS feed_meta (feed TEXT PRIMARY KEY, meta TEXT)')
+        return db
+    
+    def import_seen_items(self):
+        """Import seen items from the old seen_items.json into an empty database."""
         try:
-            # Check if path exists and is a directory (Docker volume mount issue)
-            if self.seen_file.exists() and self.seen_file.is_dir():
-                logger.warning(f"seen_items.json is a directory, removing it and creating a new file")
-                import shutil
-                shutil.rmtree(self.seen_file)
-            
-            if not self.seen_file.exists():
-                return {}
+            if not self.seen_file.is_file():
+                return
+            if self.seen_db.execute('SELECT 1 FROM seen LIMIT 1').fetchone():
+                return
             
             with open(self.seen_file, 'r') as f:
-                return json.load(f)
+                seen_items = self._rehash_seen_items(json.load(f))
+            
+            rows = [
+                (feed_url, item_hash, item.get('url', ''), item.get('title', ''), item.get('seen_at', ''))
+                for feed_url, items in seen_items.items()
+                for item_hash, item in items.items()
+            ]
+            with self.seen_db:
+                self.seen_db.execute('BEGIN')
+                self.seen_db.executemany('INSERT OR IGNORE INTO seen VALUES (?, ?, ?, ?, ?)', rows)
+            logger.info(f"Imported {len(rows)} seen items from {self.seen_file}")
         except Exception as e:
-            logger.warning(f"Error loading seen items: {e}")
-            return {}
+            logger.warning(f"Error importing seen items from {self.seen_file}: {e}")
     
-    def save_seen_items(self):
-        """Save seen items to seen_items.json."""
+    def _rehash_seen_items(self, seen_items):
+        """Re-key items stored under the old 64-char SHA-256 hashes.
+        
+        Each stored item keeps its URL, so the new hash can be computed from it.
+        """
+        for feed_url, items in seen_items.items():
+            if not any(len(item_hash) == 64 for item_hash in items):
+                continue
+            logger.info(f"Migrating seen item hashes for {feed_url}")
+            seen_items[feed_url] = {
+                self.get_item_hash(feed_url, item['url']) if len(item_hash) == 64 and item.get('url') else item_hash: item
+                for item_hash, item in items.items()
+            }
+        return seen_items
+    
+    def load_feed_meta(self):
+        """Load the stored metadata for every feed."""
         try:
-            with open(self.seen_file, 'w') as f:
-                json.dump(self.seen_items, f, indent=2)
+            rows = self.seen_db.execute('SELECT feed, meta FROM feed_meta').fetchall()
+            return {feed_url: json.loads(meta) for feed_url, meta in rows}
         except Exception as e:
-            logger.error(f"Error saving seen items: {e}")
+            logger.warning(f"Error loading feed metadata: {e}")
+            return {}
+    
+    def save_feed_meta(self, feed_url):
+        """Persist the metadata captured by the last fetch of a feed, if any."""
+        with self._seen_lock:
+            meta = self._pending_feed_meta.pop(feed_url, None)
+            # Skip the write when nothing changed
+            if meta is None or meta == self.feed_meta.get(feed_url):
+                return
+            self.feed_meta[feed_url] = meta
+            self.seen_db.execute(
+                'INSERT OR REPLACE INTO feed_meta VALUES (?, ?)', (feed_url, json.dumps(meta))
+            )
+    
+    def is_known_feed(self, feed_url):
+        """Check if any item from a feed has been seen before."""
+        with self._seen_lock:
+            return self.seen_db.execute(
+                'SELECT 1 FROM seen WHERE feed = ? LIMIT 1', (feed_url,)
+            ).fetchone() is not None
+    
+    def is_seen(self, feed_url, item_hash):
+        """Check if an item has been seen before."""
+        with self._seen_lock:
+            return self.seen_db.execute(
+                'SELECT 1 FROM seen WHERE feed = ? AND hash = ?', (feed_url, item_hash)
+            ).fetchone() is not None
+    
+    def mark_seen(self, feed_url, item_hash, item_url, title, seen_at):
+        """Record an item as seen."""
+        with self._seen_lock:
+            self.seen_db.execute(
+                'INSERT OR IGNORE INTO seen VALUES (?, ?, ?, ?, ?)',
+                (feed_url, item_hash, item_url, title, seen_at)
+            )
     
     def get_item_hash(self, feed_url, item_url):
-        """Generate a unique hash for an RSS item."""
-        return hashlib.sha256(f"{feed_url}:{item_url}".encode()).hexdigest()
+        """Generate a unique hash for an RSS item.
+        
+        This is only used as a dedup key, so an 8-byte BLAKE2 digest is plenty
+        and keeps the seen items database small.
+        """
+        return hashlib.blake2b(f"{feed_url}:{item_url}".encode(), digest_size=8).hexdigest()
     
     def get_item_published_date(self, item):
         """Extract publication date from RSS item and convert to ISO 8601 format (YYYY-MM-DDTHH:MM:SS+TZ)."""
         # Try published_parsed first (most reliable)
         if hasattr(item, 'published_parsed') and item.published_parsed:
             try:
-                # Convert struct_time to datetime
-                dt = datetime(*item.published_parsed[:6])
-                # Format as ISO 8601 with timezone (assuming UTC if no timezone info)
+                # feedparser normalises dates to a UTC struct_time, so format it directly
                 # Use +0000 format (4 digits) instead of +00:00 (5 chars) as API expects
-                return dt.strftime('%Y-%m-%dT%H:%M:%S+0000')
+                return time.strftime('%Y-%m-%dT%H:%M:%S+0000', item.published_parsed)
             except (ValueError, OSError, TypeError) as e:
                 logger.debug(f"Error converting published_parsed to ISO format: {e}")
         
         # Fall back to updated_parsed if published_parsed is not available
         if hasattr(item, 'updated_parsed') and item.updated_parsed:
             try:
-                # Convert struct_time to datetime
-                dt = datetime(*item.updated_parsed[:6])
-                # Format as ISO 8601 with timezone (assuming UTC if no timezone info)
+                # feedparser normalises dates to a UTC struct_time, so format it directly
                 # Use +0000 format (4 digits) instead of +00:00 (5 chars) as API expects
-                return dt.strftime('%Y-%m-%dT%H:%M:%S+0000')
+                return time.strftime('%Y-%m-%dT%H:%M:%S+0000', item.updated_parsed)
             except (ValueError, OSError, TypeError) as e:
                 logger.debug(f"Error converting updated_parsed to ISO format: {e}")
         
@@ -256,9 +425,7 @@ class RSSFeedTracker:
     
     def is_medium_url(self, url):
         """Check if a URL is hosted on Medium."""
-        if not url:
-            return False
-        return 'medium.com' in url.lower()
+        return is_medium_url(url)
     
     def resolve_url(self, feed_url, item_url):
         """Resolve a potentially relative URL to an absolute URL using the feed URL as base.
@@ -282,15 +449,55 @@ class RSSFeedTracker:
         """Fetch and parse an RSS feed."""
         try:
             logger.info(f"Fetching feed: {feed_url}")
+            
+            # Ask the server to skip the body if the feed hasn't changed
+            meta = self.feed_meta.get(feed_url, {})
+            headers = {}
+            if meta.get('etag'):
+                headers['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'):
+                headers['If-Modified-Since'] = meta['last_modified']
+            
             # Fetch feed content with timeout
-            response = requests.get(feed_url, timeout=5)
+            response = self.session.get(feed_url, headers=headers, timeout=5)
             response.raise_for_status()
             
-            # Parse the feed content
-            feed = feedparser.parse(response.content)
+            if response.status_code == 304:
+                logger.info(f"Feed not modified since last fetch: {feed_url}")
+                return []
+            
+            # Many servers don't send validators but return identical bodies,
+            # so skip the (comparatively slow) parse when the body hasn't changed
+            body_hash = hashlib.blake2b(response.content, digest_size=8).hexdigest()
+            if body_hash == meta.get('body_hash'):
+                logger.info(f"Feed unchanged since last fetch: {feed_url}")
+                return []
+            
+            # Parse the feed content, passing the response headers so feedparser
+            # can use the Content-Type charset and Content-Location like it would
+            # if it had fetched the feed itself (it expects lowercase names).
+            # Relative links in the entry HTML aren't used, so skip rewriting them.
+            # Sanitizing stays on because HTML titles are passed on to Wallabag.
+            response_headers = {name.lower(): value for name, value in response.headers.items()}
+            feed = feedparser.parse(response.content, response_headers=response_headers,
+                                    resolve_relative_uris=False)
+            
+            # Saved by publish_phase once this fetch's items have been handled
+            with self._seen_lock:
+                self._pending_feed_meta[feed_url] = {
+                    'etag': response.headers.get('ETag'),
+                    'last_modified': response.headers.get('Last-Modified'),
+                    'body_hash': body_hash,
+                }
             
             if feed.bozo:
-                logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
+                # Feeds served as text/html or text/plain, or with a wrong charset,
+                # still parse fine, so only real parse failures are worth a warning
+                if isinstance(feed.bozo_exception, (feedparser.NonXMLContentType,
+                                                    feedparser.CharacterEncodingOverride)):
+                    logger.debug(f"Feed parsing note for {feed_url}: {feed.bozo_exception}")
+                else:
+                    logger.warning(f"Feed parsing warning for {feed_url}: {feed.bozo_exception}")
             
             if not feed.entries:
                 logger.warning(f"No entries found in feed: {feed_url}")
@@ -300,7 +507,7 @@ class RSSFeedTracker:
             logger.info(f"Found {len(items)} items in feed: {feed_url}")
             return items
         except requests.exceptions.Timeout:
-            logger.error(f"Timeout fetching feed {feed_url} (5 seconds)")
+            logger.error(f"Timeout fetching feed {feed_url} (5 seconds per attempt)")
             return []
         except requests.exceptions.RequestException as e:
             logger.error(f"Error fetching feed {feed_url}: {e}")
@@ -309,20 +516,26 @@ class RSSFeedTracker:
             logger.error(f"Error parsing feed {feed_url}: {e}")
             return []
     
-    def process_feed(self, feed_config):
-        """Process a single RSS feed."""
+    def fetch_phase(self, feed_config):
+        """Fetch a single RSS feed and return the items not seen before.
+        
+        Only reads from the source feed and the seen items database, so it is safe to run
+        for several feeds at once in the fetch thread pool.
+        
+        Returns:
+            A list of dicts describing the new items, ready for publish_phase
+        """
         feed_url = feed_config.get('url')
         feed_name = feed_config.get('name', feed_url)
-        tags = feed_config.get('tags', [])
         max_items = feed_config.get('max_items', DEFAULT_FETCH_COUNT)
+        ordered = feed_config.get('ordered', True)
         
         if not feed_url:
             logger.error(f"Feed config missing URL: {feed_config}")
-            return
+            return []
         
-        # Check if this is a new feed (not in seen_items)
-        feed_key = feed_url
-        is_new_feed = feed_key not in self.seen_items
+        # Check if this is a new feed (no items seen yet)
+        is_new_feed = not self.is_known_feed(feed_url)
         
         if is_new_feed:
             logger.info(f"New feed detected: {feed_name}. Fetching last {max_items} items.")
@@ -331,7 +544,8 @@ class RSSFeedTracker:
         
         items = self.fetch_feed(feed_url, max_items=max_items)
         
-        new_count = 0
+        new_items = []
+        batch_hashes = set()
         for item in items:
             item_url = item.get('link', '')
             if not item_url:
@@ -342,19 +556,15 @@ class RSSFeedTracker:
             
             item_hash = self.get_item_hash(feed_url, item_url)
             
-            # Check if we've seen this item before
-            if item_hash in self.seen_items.get(feed_key, {}):
+            # Check if we've seen this item before (or earlier in this feed)
+            if item_hash in batch_hashes:
                 continue
-            
-            # Mark as seen
-            if feed_key not in self.seen_items:
-                self.seen_items[feed_key] = {}
-            
-            self.seen_items[feed_key][item_hash] = {
-                'url': item_url,
-                'title': item.get('title', ''),
-                'seen_at': datetime.now().isoformat()
-            }
+            if self.is_seen(feed_url, item_hash):
+                # Feeds list the newest items first, so the rest have been seen too
+                if ordered and not is_new_feed:
+                    break
+                continue
+            batch_hashes.add(item_hash)
             
             # Extract tags from RSS item
             item_tags = []
@@ -365,18 +575,59 @@ class RSSFeedTracker:
                 # Fallback to category if no tags
                 item_tags = [item.category]
             
-            # Post to Wallabag
-            item_title = item.get('title', '')
-            published_date = self.get_item_published_date(item)
-            tags_string = ','.join(item_tags) if item_tags else None
+            new_items.append({
+                'feed_url': feed_url,
+                'hash': item_hash,
+                'url': item_url,
+                'title': item.get('title', ''),
+                'tags': ','.join(item_tags) if item_tags else None,
+                'published_at': self.get_item_published_date(item),
+            })
+        
+        return new_items
+    
+    def publish_phase(self, feed_config, new_items):
+        """Mark new items from a feed as seen and post them to Wallabag.
+        
+        Runs on the main thread so that Wallabag only ever sees one request
+        at a time, optionally spaced out by WALLABAG_POST_DELAY_MS.
+        """
+        feed_url = feed_config.get('url')
+        feed_name = feed_config.get('name', feed_url)
+        
+        # One UTC timestamp for the whole batch
+        seen_at = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        
+        new_count = 0
+        # Post oldest-first so that, if we stop partway, the items already marked
+        # seen are the oldest ones. fetch_phase stops scanning at the first seen
+        # item, so marking newer items first would hide the older ones for good.
+        for new_item in reversed(new_items):
+            if self._shutdown_event.is_set():
+                break
+            
+            item_url = new_item['url']
+            item_title = new_item['title']
+            
+            # Mark as seen
+            self.mark_seen(new_item['feed_url'], new_item['hash'], item_url, item_title, seen_at)
             
             # Use Freedium mirror for Medium posts
             actual_url = item_url
             if self.is_medium_url(item_url):
-                actual_url = f"https://freedium-mirror.cfd/{item_url}"
+                actual_url = to_freedium(item_url)
                 logger.info(f"Using Freedium mirror for Medium post: {item_title}")
             
-            result = self.wallabag.create_entry(actual_url, title=item_title, tags=tags_string, published_at=published_date)
+            # Space out every POST in the cycle, including across feeds
+            if self._last_post_at is not None and WALLABAG_POST_DELAY_MS > 0:
+                remaining = WALLABAG_POST_DELAY_MS / 1000 - (time.monotonic() - self._last_post_at)
+                if remaining > 0:
+                    self._shutdown_event.wait(remaining)
+            
+            # Post to Wallabag
+            result = self.wallabag.create_entry(actual_url, title=item_title, tags=new_item['tags'],
+                                                published_at=new_item['published_at'])
+            self._last_post_at = time.monotonic()
             
             if result:
                 new_count += 1
@@ -386,7 +637,25 @@ class RSSFeedTracker:
         
         if new_count > 0:
             logger.info(f"Processed {new_count} new items from {feed_name}")
-            self.save_seen_items()
+        
+        # Only remember the feed's validators once its new items are handled,
+        # otherwise an interrupted cycle would get a 304 and miss them next time
+        if not self._shutdown_event.is_set():
+            self.save_feed_meta(feed_url)
+    
+    def _safe_fetch_phase(self, feed_config):
+        """Run fetch_phase for a feed, logging any error instead of raising it.
+        
+        Used as the worker function for the feed thread pool so that one bad
+        feed doesn't abort the rest of the batch.
+        """
+        if self._shutdown_event.is_set():
+            return []
+        try:
+            return self.fetch_phase(feed_config)
+        except Exception as e:
+            logger.error(f"Error fetching feed {feed_config.get('url', 'unknown')}: {e}", exc_info=True)
+            return []
     
     def run(self, once=False, clip=False):
         """Run the RSS feed tracker.
@@ -403,7 +672,7 @@ class RSSFeedTracker:
         logger.info("Starting RSS feed tracker" + mode_str)
         
         try:
-            while not self.shutdown_requested:
+            while not self._shutdown_event.is_set():
                 try:
                     feeds = self.load_feeds()
                     
@@ -411,25 +680,29 @@ class RSSFeedTracker:
                         logger.warning("No feeds configured. Add feeds to feeds.json")
                     else:
                         logger.info(f"Processing {len(feeds)} feeds")
-                        for feed_config in feeds:
-                            if self.shutdown_requested:
+                        # Get a token up front so the whole cycle shares it
+                        self.wallabag.get_token()
+                        
+                        # Feeds are IO-bound, so fetch them concurrently...
+                        with ThreadPoolExecutor(max_workers=min(FETCH_WORKERS, len(feeds))) as executor:
+                            new_items_per_feed = list(executor.map(self._safe_fetch_phase, feeds))
+                        
+                        # ...but post to Wallabag one item at a time
+                        self._last_post_at = None
+                        for feed_config, new_items in zip(feeds, new_items_per_feed):
+                            if self._shutdown_event.is_set():
                                 break
                             try:
-                                self.process_feed(feed_config)
+                                self.publish_phase(feed_config, new_items)
                             except Exception as e:
-                                logger.error(f"Error processing feed {feed_config.get('url', 'unknown')}: {e}", exc_info=True)
+                                logger.error(f"Error publishing feed {feed_config.get('url', 'unknown')}: {e}", exc_info=True)
                     
-                    if once or self.shutdown_requested:
+                    if once or self._shutdown_event.is_set():
                         break
                     
-                    # Sleep in smaller intervals to check shutdown flag
+                    # Sleep until the next cycle, waking immediately on shutdown
                     logger.info(f"Sleeping for {INTERVAL_MINUTES} minutes...")
-                    sleep_seconds = INTERVAL_MINUTES * 60
-                    sleep_interval = 1  # Check every second
-                    slept = 0
-                    while slept < sleep_seconds and not self.shutdown_requested:
-                        time.sleep(min(sleep_interval, sleep_seconds - slept))
-                        slept += sleep_interval
+                    self._shutdown_event.wait(timeout=INTERVAL_MINUTES * 60)
                     
                     # Exit after sleep if clip mode
                     if clip:
@@ -438,25 +711,17 @@ class RSSFeedTracker:
                 
                 except KeyboardInterrupt:
                     logger.info("Received KeyboardInterrupt, shutting down...")
-                    self.shutdown_requested = True
+                    self._shutdown_event.set()
                     break
                 except Exception as e:
                     logger.error(f"Unexpected error in main loop: {e}", exc_info=True)
-                    if once or self.shutdown_requested:
+                    if once or self._shutdown_event.is_set():
                         break
-                    # Sleep in smaller intervals to check shutdown flag
+                    # Sleep until the next cycle, waking immediately on shutdown
                     logger.info(f"Sleeping for {INTERVAL_MINUTES} minutes before retry...")
-                    sleep_seconds = INTERVAL_MINUTES * 60
-                    sleep_interval = 1
-                    slept = 0
-                    while slept < sleep_seconds and not self.shutdown_requested:
-                        time.sleep(min(sleep_interval, sleep_seconds - slept))
-                        slept += sleep_interval
+                    self._shutdown_event.wait(timeout=INTERVAL_MINUTES * 60)
         finally:
-            # Always save seen items on shutdown
-            if self.seen_items:
-                logger.info("Saving seen items before shutdown...")
-                self.save_seen_items()
+            self.seen_db.close()
             logger.info("RSS feed tracker stopped")
 
 
@@ -480,8 +745,9 @@ def main():
     
     logger.info(f"Wallabag URL: {WALLABAG_URL}")
     logger.info(f"Feeds file: {FEEDS_FILE}")
-    logger.info(f"Seen items file: {SEEN_FILE}")
+    logger.info(f"Seen items database: {SEEN_DB}")
     logger.info(f"Check interval: {INTERVAL_MINUTES} minutes")
+    logger.info(f"Fetch workers: {FETCH_WORKERS}")
     
     tracker = RSSFeedTracker()
     tracker.run(once=args.once, clip=args.clip)
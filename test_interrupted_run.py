@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Regression test: a run interrupted partway through posting a feed must not
+lose the items it didn't get to on the next run.
+"""
+import os
+import sys
+import tempfile
+
+import feedparser
+
+data_dir = tempfile.mkdtemp()
+os.environ['SEEN_DB'] = os.path.join(data_dir, 'seen_items.db')
+os.environ['SEEN_FILE'] = os.path.join(data_dir, 'seen_items.json')
+os.environ['TOKEN_FILE'] = os.path.join(data_dir, 'token.json')
+
+import rss_tracker
+
+FEED_URL = "https://example.com/feed.xml"
+
+
+def make_feed(count):
+    """Build an RSS feed with items 1..count, newest first."""
+    items = ''.join(
+        f"<item><title>Item {n}</title><link>https://example.com/{n}</link></item>"
+        for n in range(count, 0, -1)
+    )
+    return f'<?xml version="1.0"?><rss version="2.0"><channel><title>t</title>{items}</channel></rss>'
+
+
+def run_once(feed_count, stop_after=None):
+    """Run one fetch+publish cycle, requesting shutdown after stop_after posts."""
+    tracker = rss_tracker.RSSFeedTracker()
+    tracker.fetch_feed = lambda url, max_items=None: feedparser.parse(make_feed(feed_count)).entries[:max_items]
+    posted = []
+    
+    def create_entry(url, title=None, tags=None, published_at=None):
+        posted.append(title)
+        if stop_after is not None and len(posted) >= stop_after:
+            tracker._shutdown_event.set()
+        return {'id': len(posted)}
+    
+    tracker.wallabag.create_entry = create_entry
+    feed_config = {'name': 'Example', 'url': FEED_URL}
+    tracker.publish_phase(feed_config, tracker.fetch_phase(feed_config))
+    tracker.seen_db.close()
+    return posted
+
+
+print("🧪 Testing interrupted run recovery\n")
+
+first = run_once(5, stop_after=2)
+print(f"Run 1 (interrupted): {first}")
+
+second = run_once(6)
+print(f"Run 2: {second}")
+
+all_posted = set(first) | set(second)
+missing = [f"Item {n}" for n in range(1, 7) if f"Item {n}" not in all_posted]
+
+if missing:
+    print(f"\n❌ Never posted: {missing}")
+    sys.exit(1)
+print("\n✅ Every item was posted")
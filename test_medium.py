@@ -3,49 +3,128 @@
 Quick test to verify Medium URL detection and Freedium prefixing.
 """
 import json
+import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
 import feedparser
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from medium_url import KNOWN_MEDIUM_DOMAINS, is_medium_url, to_freedium
 
-def is_medium_url(url):
-    """Check if a URL is hosted on Medium."""
-    if not url:
-        return False
-    return 'medium.com' in url.lower()
+# Number of items to show per feed
+MAX_ITEMS = 3
+
+# Shared session so repeated fetches reuse keep-alive connections. requests
+# already advertises every encoding it can decode (gzip/deflate, plus br if
+# brotli is installed), so only the User-Agent needs setting.
+_SESSION = requests.Session()
+_SESSION.headers['User-Agent'] = 'rss-wallabag/1.0'
+_SESSION.mount('https://', HTTPAdapter(pool_connections=20, pool_maxsize=50,
+                                       max_retries=Retry(total=2, backoff_factor=0.3)))
+
+# ETag / Last-Modified from the last fetch of each feed, kept between runs
+VALIDATORS_FILE = Path(__file__).with_name('.test_medium_validators.json')
+
+def load_validators():
+    """Load the saved (etag, last_modified) pairs, keyed by feed URL."""
+    try:
+        with open(VALIDATORS_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_validators(validators):
+    """Save the (etag, last_modified) pairs for the next run."""
+    with open(VALIDATORS_FILE, 'w') as f:
+        json.dump(validators, f, indent=2)
+
+def _fetch_one(url, validators):
+    """Fetch a single feed's raw content, or None if it hasn't changed since the last run."""
+    etag, last_modified = validators.get(url, (None, None))
+    headers = {}
+    if etag:
+        headers['If-None-Match'] = etag
+    if last_modified:
+        headers['If-Modified-Since'] = last_modified
+    
+    response = _SESSION.get(url, headers=headers, timeout=10)
+    response.raise_for_status()
+    if response.status_code == 304:
+        return None
+    
+    validators[url] = (response.headers.get('ETag'), response.headers.get('Last-Modified'))
+    return response.content
+
+def fetch_feeds(urls, validators, max_workers=8):
+    """Fetch feeds concurrently, yielding (url, parsed feed) as each one completes.
+    
+    The parsed feed is None for feeds that haven't changed since the last run.
+    validators is updated in place with each changed feed's ETag / Last-Modified.
+    max_workers stays below the session's pool_maxsize so every worker gets a pooled connection.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {executor.submit(_fetch_one, url, validators): url for url in urls}
+        for future in as_completed(futures):
+            content = future.result()
+            if content is None:
+                yield futures[future], None
+                continue
+            # Only titles and links are shown, so skip processing the entry HTML
+            feed = feedparser.parse(content, sanitize_html=False, resolve_relative_uris=False)
+            feed['entries'] = feed['entries'][:MAX_ITEMS]
+            yield futures[future], feed
 
 def test_medium_feed():
-    """Test fetching a Medium feed and showing URL transformation."""
-    feed_url = "https://steve-yegge.medium.com/feed"
+    """Test fetching Medium feeds and showing URL transformation."""
+    feed_urls = ["https://steve-yegge.medium.com/feed"]
     
-    print(f"🔍 Fetching feed: {feed_url}\n")
+    for feed_url in feed_urls:
+        print(f"🔍 Fetching feed: {feed_url}\n")
+    
+    # Entries already shown, so duplicates within or across feeds are skipped
+    seen = set()
+    validators = load_validators()
     
     try:
-        response = requests.get(feed_url, timeout=10)
-        response.raise_for_status()
-        feed = feedparser.parse(response.content)
-        
-        if not feed.entries:
-            print("❌ No entries found in feed")
-            return
-        
-        print(f"✅ Found {len(feed.entries)} entries\n")
-        print("=" * 80)
-        
-        # Show first 3 items
-        for i, item in enumerate(feed.entries[:3], 1):
-            title = item.get('title', 'No title')
-            original_url = item.get('link', '')
+        for feed_url, feed in fetch_feeds(feed_urls, validators):
+            if feed is None:
+                print(f"💤 Feed not modified since last run: {feed_url}")
+                continue
+            
+            if not feed.entries:
+                print(f"❌ No entries found in feed: {feed_url}")
+                continue
+            
+            print(f"✅ Showing {len(feed.entries)} entries from {feed_url}\n")
+            print("=" * 80)
             
-            print(f"\n📄 Item {i}: {title}")
-            print(f"   Original URL: {original_url}")
+            # Show the first MAX_ITEMS items, buffering the output into a single write
+            out = []
+            for i, item in enumerate(feed.entries, 1):
+                key = item.get('id') or item.get('link')
+                if key:
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                
+                title = item.get('title', 'No title')
+                original_url = item.get('link', '')
+                
+                out.append(f"\n📄 Item {i}: {title}\n")
+                out.append(f"   Original URL: {original_url}\n")
+                
+                if is_medium_url(original_url, KNOWN_MEDIUM_DOMAINS):
+                    freedium_url = to_freedium(original_url)
+                    out.append(f"   🔧 Medium detected!\n")
+                    out.append(f"   ✨ Freedium URL: {freedium_url}\n")
+                else:
+                    out.append(f"   ℹ️  Not a Medium URL, no transformation needed\n")
             
-            if is_medium_url(original_url):
-                freedium_url = f"https://freedium-mirror.cfd/{original_url}"
-                print(f"   🔧 Medium detected!")
-                print(f"   ✨ Freedium URL: {freedium_url}")
-            else:
-                print(f"   ℹ️  Not a Medium URL, no transformation needed")
+            out.append("\n" + "=" * 80 + "\n")
+            sys.stdout.write(''.join(out))
         
-        print("\n" + "=" * 80)
+        save_validators(validators)
         print("✅ Test complete!")
         
     except Exception as e:
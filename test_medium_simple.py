@@ -2,12 +2,8 @@
 """
 Simple test to verify Medium URL detection logic.
 """
-
-def is_medium_url(url):
-    """Check if a URL is hosted on Medium."""
-    if not url:
-        return False
-    return 'medium.com' in url.lower()
+import sys
+from medium_url import KNOWN_MEDIUM_DOMAINS, is_medium_url, to_freedium
 
 # Test cases
 test_urls = [
@@ -16,22 +12,26 @@ test_urls = [
     "https://towardsdatascience.com/some-article",  # Medium custom domain
     "https://jonsimpson.ca/some-article",  # Not Medium
     "https://simonwillison.net/2024/something/",  # Not Medium
+    "https://evilmedium.com.phish.io/some-article",  # Lookalike host, not Medium
 ]
 
 print("🧪 Testing Medium URL Detection\n")
 print("=" * 80)
 
+# Buffer the per-URL output into a single write
+out = []
 for url in test_urls:
-    is_medium = is_medium_url(url)
+    is_medium = is_medium_url(url, KNOWN_MEDIUM_DOMAINS)
     symbol = "✅" if is_medium else "❌"
     
-    print(f"\n{symbol} URL: {url}")
-    print(f"   Medium detected: {is_medium}")
+    out.append(f"\n{symbol} URL: {url}\n")
+    out.append(f"   Medium detected: {is_medium}\n")
     
     if is_medium:
-        freedium_url = f"https://freedium-mirror.cfd/{url}"
-        print(f"   Transformed to: {freedium_url}")
+        freedium_url = to_freedium(url)
+        out.append(f"   Transformed to: {freedium_url}\n")
+sys.stdout.write(''.join(out))
 
 print("\n" + "=" * 80)
-print("\n💡 Note: Medium custom domains (like towardsdatascience.com) won't be")
-print("   detected by this simple check. Could extend if needed.")
+print("\n💡 Note: Medium custom domains (like towardsdatascience.com) are only")
+print("   detected if listed in CUSTOM_MEDIUM_DOMAINS. The tracker only rewrites medium.com.")